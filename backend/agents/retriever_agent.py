@@ -1,6 +1,6 @@
 from agent import Agent
 from state import AgentState
-from database_manager import DatabaseManager
+from database_manager import PartitionedDatabaseManager
 from backend.llm_manager import LLMManager
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
@@ -10,7 +10,7 @@ import re
 class RetrieverAgent(Agent):
     def __init__(self):
         super().__init__()
-        self.db_manager  = DatabaseManager()
+        self.db_manager  = PartitionedDatabaseManager()
         self.llm_manager = LLMManager()
         self.schema = self.db_manager.get_schema()   # Since our database is static
 
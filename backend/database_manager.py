@@ -1,5 +1,8 @@
 import sqlite3
 import os
+import re
+import glob
+from concurrent.futures import ThreadPoolExecutor
 
 class DatabaseManager:
     """
@@ -34,8 +37,8 @@ class DatabaseManager:
                 { "error": "<error message>" }.
     """
     
-    def __init__(self):
-        self.db_path = "dataset/synthetic_po.db"
+    def __init__(self, db_path: str = "dataset/synthetic_po.db"):
+        self.db_path = db_path
 
     def get_schema(self) -> str:
         """Retrieve the database schema as a string."""
@@ -72,4 +75,615 @@ class DatabaseManager:
                 return {"columns": columns, "rows": rows}
         
         except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+
+_CLAUSES = ["select", "from", "where", "group by", "having", "order by", "limit"]
+_CLAUSE_RE = re.compile(r"\b(SELECT|FROM|WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT)\b", re.IGNORECASE)
+_AGG_RE = re.compile(r"\b(SUM|COUNT|MIN|MAX|TOTAL|AVG)\s*\(", re.IGNORECASE)
+_UNSUPPORTED_RE = re.compile(
+    r"\b(OVER|UNION|INTERSECT|EXCEPT|OFFSET|GROUP_CONCAT|STRING_AGG|JSONB?_GROUP_(?:ARRAY|OBJECT))\b",
+    re.IGNORECASE,
+)
+_LITERAL = r"'((?:[^']|'')*)'"
+_IDENTIFIER_RE = re.compile(r'`(?:[^`]|``)*`|"(?:[^"]|"")*"|\[[^\]]*\]|[A-Za-z_]\w*')
+_QUOTES = {"'": "'", '"': '"', "`": "`", "[": "]"}
+
+# How each partial aggregate is folded back together across partitions.
+_MERGE_FUNCS = {"SUM": "SUM", "COUNT": "SUM", "TOTAL": "TOTAL", "MIN": "MIN", "MAX": "MAX"}
+
+
+def _mask(sql: str, parens: bool = True) -> str:
+    """Blank out quoted spans (and, if `parens`, parenthesised spans) keeping offsets intact."""
+    out, depth, quote = [], 0, None
+    for ch in sql:
+        if quote:
+            out.append(" ")
+            if ch == quote:
+                quote = None
+        elif ch in _QUOTES:
+            quote = _QUOTES[ch]
+            out.append(" ")
+        elif parens and ch == "(":
+            depth += 1
+            out.append(" ")
+        elif parens and ch == ")":
+            depth -= 1
+            out.append(" ")
+        else:
+            out.append(ch if depth == 0 else " ")
+    return "".join(out)
+
+
+def _mask_case(masked: str) -> str:
+    """Blank out CASE ... END spans in already-masked SQL, whose ANDs are not conjuncts."""
+    out, depth, start = list(masked), 0, 0
+    for m in re.finditer(r"\b(CASE|END)\b", masked, flags=re.IGNORECASE):
+        if m.group(1).upper() == "CASE":
+            if depth == 0:
+                start = m.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                out[start:m.end()] = " " * (m.end() - start)
+    if depth:
+        out[start:] = " " * (len(out) - start)
+    return "".join(out)
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Split `text` on commas that are not inside quotes or parentheses."""
+    parts, start = [], 0
+    for i, ch in enumerate(_mask(text)):
+        if ch == ",":
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return parts
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _unquote(name: str) -> str:
+    m = re.fullmatch(r'`(.*)`|"(.*)"|\[(.*)\]', name.strip(), flags=re.DOTALL)
+    if not m:
+        return name.strip()
+    inner = next(g for g in m.groups() if g is not None)
+    return inner.replace('""', '"').replace("``", "`")
+
+
+def _backtick_identifiers(sql: str) -> str:
+    """
+    Rewrite "double-quoted" identifiers as `backticked` ones. SQLite reads an
+    unresolved double-quoted identifier as a string literal, which would let a
+    merge query over `_partials` silently compare against constants instead of
+    failing; backticked identifiers raise "no such column" instead.
+    """
+    out, quote = [], None
+    for ch in sql:
+        if quote == '"':
+            if ch == '"':
+                quote = None
+                out.append("`")
+            else:
+                out.append("``" if ch == "`" else ch)
+        elif quote:
+            out.append(ch)
+            if ch == quote:
+                quote = None
+        elif ch == '"':
+            quote = '"'
+            out.append("`")
+        else:
+            if ch in _QUOTES:
+                quote = _QUOTES[ch]
+            out.append(ch)
+    return "".join(out)
+
+
+def _same_identifier(a: str, b: str) -> bool:
+    """Whether `a` and `b` name the same column, however each is quoted."""
+    a, b = a.strip(), b.strip()
+    return bool(_IDENTIFIER_RE.fullmatch(a) and _IDENTIFIER_RE.fullmatch(b)) and _unquote(a).lower() == _unquote(b).lower()
+
+
+def _column_regex(name: str) -> str:
+    escaped = re.escape(name)
+    forms = [f"`{escaped}`", f'"{escaped}"', rf"\[{escaped}\]"]
+    if re.fullmatch(r"\w+", name):
+        forms.append(escaped)
+    return "(?:" + "|".join(forms) + ")"
+
+
+def _split_alias(item: str) -> tuple[str, str | None]:
+    """Return (expression, explicit alias or None) for a single SELECT list item."""
+    matches = list(re.finditer(r"\s+AS\s+", _mask(item), flags=re.IGNORECASE))
+    if matches:
+        m = matches[-1]
+        return item[:m.start()].strip(), _unquote(item[m.end():])
+    return item.strip(), None
+
+
+class PartitionedDatabaseManager(DatabaseManager):
+    """
+    A DatabaseManager over a horizontally partitioned `procurement_orders` table.
+
+    The order history is split into several SQLite files (by default one per
+    year of `Created on`, named `dataset/synthetic_po_<YYYY>.db`), each holding
+    a `procurement_orders` table with the same schema. Callers still see one
+    logical table: `get_schema()` reports the schema of a single partition and
+    `execute_query()` accepts the same SQL as `DatabaseManager`.
+
+    For every query the manager:
+
+      • Prunes partitions whose `Created on` range cannot satisfy the top-level
+        WHERE predicate (comparisons, BETWEEN, LIKE 'YYYY%' and
+        strftime('%Y', ...) against string literals).
+      • Runs the query against the remaining files in parallel on a thread pool.
+      • Merges the partial results in an in-memory SQLite database, re-applying
+        ORDER BY / LIMIT / DISTINCT and re-aggregating decomposable aggregates
+        (SUM, COUNT, TOTAL, MIN, MAX, and AVG as SUM / COUNT).
+
+    Queries that cannot be decomposed (subqueries, joins, window functions,
+    COUNT(DISTINCT ...), ...) are answered by running the original query against
+    the relevant partitions combined behind one `procurement_orders` table.
+
+    The manager owns a thread pool; call `close()` (or use it as a context
+    manager) when it is no longer needed.
+
+    Partition bounds are compared with SQLite's text ordering, so `Created on`
+    must be stored as ISO-8601 text (YYYY-MM-DD...).
+
+    Attributes:
+        partitions (dict[str, tuple[str | None, str | None]]): Maps each
+            partition file to its [lower, upper) `Created on` range; None
+            means unbounded.
+        table_name (str): Name of the logical table.
+        partition_column (str): Column the data is partitioned on.
+    """
+
+    def __init__(
+        self,
+        partitions: dict[str, tuple[str | None, str | None]] | None = None,
+        table_name: str = "procurement_orders",
+        partition_column: str = "Created on",
+        max_workers: int | None = None,
+    ):
+        self.partitions = partitions or self.discover_partitions()
+        super().__init__(next(iter(self.partitions)))
+        self.table_name = table_name
+        self.partition_column = partition_column
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or min(len(self.partitions), (os.cpu_count() or 1) + 4),
+            thread_name_prefix="po-partition",
+        )
+
+    def close(self) -> None:
+        """Shut down the worker threads used for fan-out queries."""
+        self._pool.shutdown()
+
+    def __enter__(self) -> "PartitionedDatabaseManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def discover_partitions(
+        directory: str = "dataset", prefix: str = "synthetic_po"
+    ) -> dict[str, tuple[str | None, str | None]]:
+        """Find yearly partition files, falling back to the unpartitioned database."""
+        partitions = {}
+        for path in sorted(glob.glob(os.path.join(directory, f"{prefix}_[0-9][0-9][0-9][0-9].db"))):
+            year = int(os.path.basename(path)[len(prefix) + 1:-3])
+            partitions[path] = (f"{year:04d}", f"{year + 1:04d}")
+        return partitions or {os.path.join(directory, f"{prefix}.db"): (None, None)}
+
+    @staticmethod
+    def create_partitions(
+        source_path: str = "dataset/synthetic_po.db",
+        directory: str = "dataset",
+        prefix: str = "synthetic_po",
+        table_name: str = "procurement_orders",
+        partition_column: str = "Created on",
+    ) -> dict[str, tuple[str | None, str | None]]:
+        """Split an unpartitioned database into one file per year of `partition_column`."""
+        column = _quote(partition_column)
+        table = _quote(table_name)
+        with sqlite3.connect(source_path) as source:
+            bad = source.execute(
+                f"SELECT COUNT(*) FROM {table} "
+                f"WHERE {column} IS NULL OR substr({column}, 1, 4) NOT GLOB '[0-9][0-9][0-9][0-9]'"
+            ).fetchone()[0]
+            if bad:
+                raise Exception(f"{bad} rows have no ISO-8601 {partition_column!r} value.")
+            years = [row[0] for row in source.execute(
+                f"SELECT DISTINCT substr({column}, 1, 4) FROM {table} ORDER BY 1"
+            )]
+            ddl = [row[0] for row in source.execute(
+                "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND sql IS NOT NULL "
+                "ORDER BY type = 'table' DESC",
+                (table_name,),
+            )]
+
+        paths = {year: os.path.join(directory, f"{prefix}_{year}.db") for year in years}
+        for path in paths.values():
+            if os.path.exists(path) or os.path.exists(path + ".tmp"):
+                raise Exception(f"Partition {path} already exists.")
+
+        # Build every partition under a temporary name first, so a failure never
+        # leaves a partial file where discover_partitions() would pick it up.
+        written = []
+        try:
+            for year, path in paths.items():
+                written.append(path + ".tmp")
+                conn = sqlite3.connect(path + ".tmp")
+                try:
+                    for statement in ddl:
+                        conn.execute(statement)
+                    conn.execute("ATTACH DATABASE ? AS source", (source_path,))
+                    conn.execute(
+                        f"INSERT INTO main.{table} SELECT * FROM source.{table} "
+                        f"WHERE substr({column}, 1, 4) = ?",
+                        (year,),
+                    )
+                    conn.commit()
+                finally:
+                    conn.close()
+        except Exception:
+            for tmp_path in written:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
+
+        for path in paths.values():
+            os.replace(path + ".tmp", path)
+        return PartitionedDatabaseManager.discover_partitions(directory, prefix)
+
+    def execute_query(self, query: str) -> dict:
+        """Execute SQL query across the relevant partitions and merge the results."""
+        try:
+            query = query.strip().rstrip(";").strip()
+            clauses = self._parse_query(query)
+            paths = self._prune(clauses.get("where") if clauses else None)
+            if not paths:
+                # No partition can match, so any one of them yields the correct empty result.
+                paths = [self.db_path]
+
+            if len(paths) == 1:
+                columns, rows = self._run_partition(paths[0], query)
+            elif clauses is None:
+                columns, rows = self._run_union(paths, query)
+            else:
+                columns, rows = self._fan_out(paths, query, clauses)
+
+            if not rows:
+                raise Exception("No rows returned, but at least one row was expected.")
+
+            return {"columns": columns, "rows": rows}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    ##== Execution
+    def _run_partition(self, path: str, query: str) -> tuple[list[str], list[tuple]]:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(query)
+            return [desc[0] for desc in cursor.description], cursor.fetchall()
+        finally:
+            conn.close()
+
+    def _run_union(self, paths: list[str], query: str) -> tuple[list[str], list[tuple]]:
+        """Run `query` unchanged against the partitions combined into one temporary table or view."""
+        conn = sqlite3.connect("file::memory:", uri=True)
+        try:
+            table = _quote(self.table_name)
+            max_attached = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+
+            if len(paths) <= max_attached:
+                selects = []
+                for i, path in enumerate(paths):
+                    conn.execute(f"ATTACH DATABASE ? AS p{i}", (f"file:{path}?mode=ro",))
+                    selects.append(f"SELECT * FROM p{i}.{table}")
+                conn.execute(f"CREATE TEMP VIEW {table} AS " + " UNION ALL ".join(selects))
+            else:
+                # More partitions than SQLite can attach at once: copy them into an
+                # in-memory table, one batch of attachments at a time.
+                for start in range(0, len(paths), max_attached):
+                    batch = paths[start:start + max_attached]
+                    for i, path in enumerate(batch):
+                        conn.execute(f"ATTACH DATABASE ? AS p{i}", (f"file:{path}?mode=ro",))
+                    if start == 0:
+                        ddl = conn.execute(
+                            "SELECT sql FROM p0.sqlite_master WHERE type = 'table' AND name = ?",
+                            (self.table_name,),
+                        ).fetchone()[0]
+                        conn.execute(re.sub(r"^\s*CREATE\s+TABLE", "CREATE TEMP TABLE", ddl, flags=re.IGNORECASE))
+                    for i in range(len(batch)):
+                        conn.execute(f"INSERT INTO temp.{table} SELECT * FROM p{i}.{table}")
+                    conn.commit()
+                    for i in range(len(batch)):
+                        conn.execute(f"DETACH DATABASE p{i}")
+
+            cursor = conn.execute(query)
+            return [desc[0] for desc in cursor.description], cursor.fetchall()
+        finally:
+            conn.close()
+
+    def _fan_out(self, paths: list[str], query: str, clauses: dict) -> tuple[list[str], list[tuple]]:
+        """Run per-partition queries in parallel and merge them, or fall back to a union."""
+        plan = self._plan_aggregate(clauses) if clauses["aggregate"] else self._plan_rows(clauses)
+        if plan is None:
+            return self._run_union(paths, query)
+
+        partial_sql, merge_sql = plan
+        try:
+            if clauses["aggregate"]:
+                # SQLite derives output names from the original select list (declared
+                # column case, no table qualifier), so take them from a LIMIT 0 run.
+                names = self._pool.submit(self._run_partition, paths[0], clauses["unlimited"] + " LIMIT 0")
+            results = list(self._pool.map(lambda path: self._run_partition(path, partial_sql), paths))
+            columns = results[0][0]
+            rows = [row for _, partial_rows in results for row in partial_rows]
+
+            if merge_sql is None:
+                return columns, rows
+            if len(set(columns)) != len(columns):
+                return self._run_union(paths, query)
+            columns, rows = self._merge(columns, rows, merge_sql)
+            if clauses["aggregate"]:
+                columns = names.result()[0]
+            return columns, rows
+
+        except sqlite3.Error:
+            # The rewrite did not fit this query; the union path gives the exact answer.
+            return self._run_union(paths, query)
+
+    def _merge(self, columns: list[str], rows: list[tuple], merge_sql: str) -> tuple[list[str], list[tuple]]:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute(f"CREATE TABLE _partials ({', '.join(_quote(c) for c in columns)})")
+            conn.executemany(
+                f"INSERT INTO _partials VALUES ({', '.join('?' for _ in columns)})", rows
+            )
+            cursor = conn.execute(merge_sql)
+            return [desc[0] for desc in cursor.description], cursor.fetchall()
+        finally:
+            conn.close()
+
+    ##== Query rewriting
+    def _parse_query(self, query: str) -> dict | None:
+        """
+        Split a single-table SELECT on the logical table into its clauses.
+        Returns None for anything the fan-out rewrite does not handle.
+        """
+        query = _backtick_identifiers(query)
+        quote_masked = _mask(query, parens=False)
+        if _UNSUPPORTED_RE.search(quote_masked):
+            return None
+        if len(re.findall(r"\bSELECT\b", quote_masked, flags=re.IGNORECASE)) != 1:
+            return None
+
+        matches = list(_CLAUSE_RE.finditer(_mask(query)))
+        if not matches or matches[0].start() != 0:
+            return None
+        names = [re.sub(r"\s+", " ", m.group(1)).lower() for m in matches]
+        if names != sorted(set(names), key=_CLAUSES.index) or "from" not in names:
+            return None
+
+        clauses = {"query": query, "unlimited": query[:matches[-1].start()].rstrip() if names[-1] == "limit" else query}
+        for i, (name, m) in enumerate(zip(names, matches)):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(query)
+            clauses[name] = query[m.end():end].strip()
+
+        table = re.escape(self.table_name)
+        if not re.fullmatch(rf'`{table}`|"{table}"|\[{table}\]|{table}', clauses["from"], re.IGNORECASE):
+            return None
+        if "limit" in clauses and not clauses["limit"].isdigit():
+            return None
+
+        distinct = re.match(r"(DISTINCT|ALL)\s+", clauses["select"], re.IGNORECASE)
+        clauses["distinct"] = bool(distinct) and distinct.group(1).upper() == "DISTINCT"
+        if distinct:
+            clauses["select"] = clauses["select"][distinct.end():]
+
+        clauses["aggregate"] = (
+            "group by" in clauses
+            or "having" in clauses
+            or any(
+                _AGG_RE.search(_mask(clauses.get(name, ""), parens=False))
+                for name in ("select", "order by")
+            )
+        )
+        return clauses
+
+    def _plan_rows(self, clauses: dict) -> tuple[str, str | None]:
+        """Plan a non-aggregate query: each partition runs it as-is, then rows are re-sorted/limited."""
+        if not (clauses["distinct"] or "order by" in clauses or "limit" in clauses):
+            return clauses["query"], None
+
+        merge_sql = "SELECT DISTINCT * FROM _partials" if clauses["distinct"] else "SELECT * FROM _partials"
+        if "order by" in clauses:
+            merge_sql += f" ORDER BY {clauses['order by']}"
+        if "limit" in clauses:
+            merge_sql += f" LIMIT {clauses['limit']}"
+        return clauses["query"], merge_sql
+
+    def _plan_aggregate(self, clauses: dict) -> tuple[str, str] | None:
+        """
+        Plan an aggregate query: each partition computes group keys and partial
+        aggregates, which the merge query folds back together per group.
+        """
+        items = [_split_alias(item) for item in _split_top_level(clauses["select"])]
+        aliases = {alias.lower(): expr for expr, alias in items if alias}
+
+        keys = []
+        for term in _split_top_level(clauses["group by"]) if "group by" in clauses else []:
+            if term.isdigit():
+                if not 1 <= int(term) <= len(items):
+                    return None
+                term = items[int(term) - 1][0]
+            elif _unquote(term).lower() in aliases:
+                term = aliases[_unquote(term).lower()]
+            keys.append(term)
+
+        partials: list[str] = []
+        outer_items = []
+        for expr, alias in items:
+            outer = self._merge_expr(expr, keys, partials)
+            if outer is None:
+                return None
+            # Unaliased columns are renamed after the merge (see _fan_out).
+            outer_items.append(f"{outer} AS {_quote(alias)}" if alias else outer)
+
+        merge_sql = f"SELECT {'DISTINCT ' if clauses['distinct'] else ''}{', '.join(outer_items)} FROM _partials"
+        if keys:
+            merge_sql += " GROUP BY " + ", ".join(f"__g{i}" for i in range(len(keys)))
+        if "having" in clauses:
+            having = self._merge_expr(clauses["having"], keys, partials)
+            if having is None:
+                return None
+            merge_sql += f" HAVING {having}"
+        if "order by" in clauses:
+            terms = []
+            for term in _split_top_level(clauses["order by"]):
+                m = re.fullmatch(
+                    r"(.*?)((?:\s+(?:ASC|DESC))?(?:\s+NULLS\s+(?:FIRST|LAST))?)",
+                    term, flags=re.IGNORECASE | re.DOTALL,
+                )
+                outer = self._merge_expr(m.group(1), keys, partials)
+                if outer is None:
+                    return None
+                terms.append(outer + m.group(2))
+            merge_sql += " ORDER BY " + ", ".join(terms)
+        if "limit" in clauses:
+            merge_sql += f" LIMIT {clauses['limit']}"
+
+        select = [f"{key} AS __g{i}" for i, key in enumerate(keys)]
+        select += [f"{partial} AS __p{i}" for i, partial in enumerate(partials)]
+        if not select:
+            return None
+        partial_sql = f"SELECT {', '.join(select)} FROM {clauses['from']}"
+        if "where" in clauses:
+            partial_sql += f" WHERE {clauses['where']}"
+        if keys:
+            partial_sql += f" GROUP BY {', '.join(keys)}"
+        return partial_sql, merge_sql
+
+    def _merge_expr(self, expr: str, keys: list[str], partials: list[str]) -> str | None:
+        """
+        Rewrite `expr` over the `_partials` table: group keys become `__g<i>` and
+        each aggregate call becomes a merge of one or more partial columns
+        (appended to `partials`). Returns None if an aggregate is not decomposable.
+        """
+        normalized = re.sub(r"\s+", " ", expr.strip())
+        for i, key in enumerate(keys):
+            if normalized == re.sub(r"\s+", " ", key.strip()) or _same_identifier(expr, key):
+                return f"__g{i}"
+
+        def partial(sql: str) -> str:
+            if sql not in partials:
+                partials.append(sql)
+            return f"__p{partials.index(sql)}"
+
+        masked = _mask(expr, parens=False)
+        out, pos = [], 0
+        for m in _AGG_RE.finditer(masked):
+            if m.start() < pos:
+                return None  # nested aggregate
+            depth, end = 0, None
+            for i in range(m.end() - 1, len(masked)):
+                depth += {"(": 1, ")": -1}.get(masked[i], 0)
+                if depth == 0:
+                    end = i
+                    break
+            if end is None:
+                return None
+
+            func, arg = m.group(1).upper(), expr[m.end():end]
+            if re.match(r"\s*DISTINCT\b", arg, flags=re.IGNORECASE):
+                return None
+            if func in ("MIN", "MAX") and "," in _mask(arg):
+                return None  # scalar min()/max(), not an aggregate
+
+            if func == "AVG":
+                merged = f"CAST(SUM({partial(f'SUM({arg})')}) AS REAL) / SUM({partial(f'COUNT({arg})')})"
+            else:
+                merged = f"{_MERGE_FUNCS[func]}({partial(f'{func}({arg})')})"
+            out.append(expr[pos:m.start()])
+            out.append(merged)
+            pos = end + 1
+        out.append(expr[pos:])
+        return "".join(out)
+
+    ##== Partition pruning
+    def _prune(self, where: str | None) -> list[str]:
+        """Return the partitions whose range can satisfy the top-level WHERE predicate."""
+        constraints = self._constraints(where) if where else []
+        return [
+            path for path, (lower, upper) in self.partitions.items()
+            if all(self._may_match(op, value, lower, upper) for op, value in constraints)
+        ]
+
+    def _constraints(self, where: str) -> list[tuple[str, str]]:
+        """
+        Extract (operator, literal) bounds on the partition column from AND-ed conjuncts.
+        Returns no bounds unless the predicate is a plain conjunction, so pruning
+        never drops a partition that could hold matching rows.
+        """
+        masked = _mask_case(_mask(where))
+        if re.search(r"\b(OR|NOT|IS|ISNULL|NOTNULL)\b", masked, flags=re.IGNORECASE):
+            return []
+
+        conjuncts, start, in_between = [], 0, False
+        for m in re.finditer(r"\b(BETWEEN|AND)\b", masked, flags=re.IGNORECASE):
+            if m.group(1).upper() == "BETWEEN":
+                in_between = True
+            elif in_between:
+                in_between = False
+            else:
+                conjuncts.append(where[start:m.start()].strip())
+                start = m.end()
+        conjuncts.append(where[start:].strip())
+
+        table = _column_regex(self.table_name)
+        col = rf"(?:{table}\s*\.\s*)?{_column_regex(self.partition_column)}"
+        year = rf"(?:strftime\s*\(\s*'%Y'\s*,\s*{col}\s*\)|substr\s*\(\s*{col}\s*,\s*1\s*,\s*4\s*\))"
+        op = r"(==|=|<=|>=|<|>)"
+        flipped = {"<": ">", ">": "<", "<=": ">=", ">=": "<=", "=": "=", "==": "="}
+        normalized = {"==": "="}
+
+        constraints = []
+        for conjunct in conjuncts:
+            if m := re.fullmatch(rf"{col}\s*{op}\s*{_LITERAL}", conjunct, re.IGNORECASE):
+                constraints.append((normalized.get(m.group(1), m.group(1)), m.group(2).replace("''", "'")))
+            elif m := re.fullmatch(rf"{_LITERAL}\s*{op}\s*{col}", conjunct, re.IGNORECASE):
+                constraints.append((flipped[m.group(2)], m.group(1).replace("''", "'")))
+            elif m := re.fullmatch(rf"{col}\s+BETWEEN\s+{_LITERAL}\s+AND\s+{_LITERAL}", conjunct, re.IGNORECASE):
+                constraints += [(">=", m.group(1).replace("''", "'")), ("<=", m.group(2).replace("''", "'"))]
+            elif m := re.fullmatch(rf"{col}\s+LIKE\s+'([0-9-]+)%'", conjunct, re.IGNORECASE):
+                prefix = m.group(1)
+                constraints += [(">=", prefix), ("<", prefix[:-1] + chr(ord(prefix[-1]) + 1))]
+            elif m := re.fullmatch(rf"{year}\s*{op}\s*'(\d{{4}})'", conjunct, re.IGNORECASE):
+                y, next_y = m.group(2), f"{int(m.group(2)) + 1:04d}"
+                constraints += {
+                    "=": [(">=", y), ("<", next_y)], "==": [(">=", y), ("<", next_y)],
+                    ">=": [(">=", y)], ">": [(">=", next_y)],
+                    "<": [("<", y)], "<=": [("<", next_y)],
+                }[m.group(1)]
+        return constraints
+
+    @staticmethod
+    def _may_match(op: str, value: str, lower: str | None, upper: str | None) -> bool:
+        """Whether some value v with lower <= v < upper can satisfy `v <op> value`."""
+        if op in (">", ">="):
+            return upper is None or value < upper
+        if op == "<":
+            return lower is None or lower < value
+        if op == "<=":
+            return lower is None or lower <= value
+        return (lower is None or lower <= value) and (upper is None or value < upper)
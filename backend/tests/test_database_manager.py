@@ -0,0 +1,201 @@
+import os
+import random
+import sqlite3
+
+import pytest
+
+import database_manager
+from database_manager import DatabaseManager, PartitionedDatabaseManager
+
+YEARS = ("2021", "2022", "2023")
+
+
+def _build_source(path: str, years: tuple[str, ...] = YEARS) -> None:
+    rng = random.Random(26)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE procurement_orders ("PO Name" TEXT, "Created on" TEXT, "Created by" TEXT, '
+        '"Vendor" TEXT, qty INTEGER, "Amount, USD" REAL)'
+    )
+    conn.execute('CREATE INDEX idx_created_on ON procurement_orders ("Created on")')
+    rows = [
+        (
+            f"PO{i:04d}",
+            f"{rng.choice(years)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            rng.choice(["Ann", "Bob", "Cid", "Dee"]),
+            rng.choice(["Acme", "Globex", "Initech", None]),
+            rng.randint(1, 150),
+            round(rng.uniform(10, 5000), 2) if rng.random() > 0.05 else None,
+        )
+        for i in range(750)
+    ]
+    conn.executemany("INSERT INTO procurement_orders VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def managers(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("dataset"))
+    source = os.path.join(directory, "synthetic_po.db")
+    _build_source(source)
+    partitions = PartitionedDatabaseManager.create_partitions(source, directory)
+    with PartitionedDatabaseManager(partitions) as partitioned:
+        yield DatabaseManager(source), partitioned
+
+
+def _normalize(result: dict, ordered: bool):
+    if "error" in result:
+        return "error"
+    rows = [tuple(round(v, 6) if isinstance(v, float) else v for v in row) for row in result["rows"]]
+    return result["columns"], rows if ordered else sorted(rows, key=repr)
+
+
+QUERIES = [
+    # Decomposable aggregates
+    "SELECT COUNT(*), SUM(qty), TOTAL(`Amount, USD`), MIN(`Created on`), MAX(`Amount, USD`) FROM procurement_orders",
+    "SELECT AVG(`Amount, USD`) AS avg_usd, AVG(qty) FROM procurement_orders",
+    "SELECT `Created by`, SUM(`Amount, USD`) AS total_amount_usd, COUNT(`Created by`) AS num_transaction "
+    "FROM procurement_orders GROUP BY `Created by` ORDER BY num_transaction DESC, `Created by`",
+    "SELECT Vendor, `Created by`, COUNT(`PO Name`) AS n FROM procurement_orders GROUP BY Vendor, `Created by`",
+    "SELECT `Created by`, ROUND(AVG(`Amount, USD`), 2) avg_amt FROM procurement_orders "
+    "GROUP BY 1 HAVING COUNT(*) > 150 ORDER BY SUM(qty) DESC LIMIT 2",
+    "SELECT substr(`Created on`, 1, 7) AS month, SUM(qty) / COUNT(*) AS r FROM procurement_orders "
+    "GROUP BY month ORDER BY month",
+    # Column names must match the single file
+    "SELECT procurement_orders.Vendor, COUNT(*) FROM procurement_orders GROUP BY procurement_orders.Vendor",
+    "select vendor, count(*) from procurement_orders group by vendor",
+    # Double-quoted identifiers must resolve as columns, never as string literals
+    'SELECT "PO Name" FROM procurement_orders ORDER BY "Created on" DESC, "PO Name" LIMIT 3',
+    'SELECT "Vendor", COUNT(*) FROM procurement_orders GROUP BY Vendor',
+    'SELECT Vendor, COUNT(*) FROM procurement_orders GROUP BY "vendor"',
+    'SELECT "Vendor", MAX("PO Name") FROM procurement_orders',
+    'SELECT "Created by", COUNT(*) FROM procurement_orders GROUP BY "Created by" HAVING "Created by" = \'Ann\'',
+    'SELECT "Created by", SUM("Amount, USD") AS total FROM procurement_orders '
+    'WHERE "Created on" >= \'2022\' GROUP BY "Created by" ORDER BY total DESC',
+    'SELECT COUNT(*) FROM procurement_orders WHERE Vendor = "Acme"',
+    # Row queries with ORDER BY / LIMIT / DISTINCT
+    "SELECT `PO Name`, `Amount, USD` FROM procurement_orders ORDER BY `Amount, USD` DESC, `PO Name` LIMIT 5",
+    "SELECT DISTINCT Vendor FROM procurement_orders ORDER BY Vendor",
+    "SELECT * FROM procurement_orders WHERE qty > 140",
+    # Union fallback
+    "SELECT * FROM procurement_orders WHERE `Created on` = (SELECT MIN(`Created on`) FROM procurement_orders)",
+    "SELECT COUNT(DISTINCT Vendor) FROM procurement_orders",
+    "SELECT `PO Name`, ROW_NUMBER() OVER (ORDER BY qty, `PO Name`) FROM procurement_orders ORDER BY 2 LIMIT 3",
+    "SELECT json_array_length(json_group_array(Vendor)) FROM procurement_orders WHERE qty > 148",
+    "SELECT json_group_object(`PO Name`, qty) IS NOT NULL FROM procurement_orders WHERE qty > 148",
+    # Pruning forms
+    "SELECT COUNT(*) FROM procurement_orders WHERE `Created on` >= '2022-03-01' AND `Created on` < '2023-02-01'",
+    "SELECT * FROM procurement_orders WHERE '2022-06-30' >= `Created on` ORDER BY `PO Name`",
+    "SELECT * FROM procurement_orders WHERE `Created on` BETWEEN '2021-01-01' AND '2021-01-31' ORDER BY `PO Name`",
+    "SELECT * FROM procurement_orders WHERE `Created on` LIKE '2023-02%' ORDER BY `PO Name`",
+    "SELECT Vendor, SUM(qty) FROM procurement_orders WHERE strftime('%Y', `Created on`) = '2022' GROUP BY Vendor",
+    "SELECT COUNT(*) FROM procurement_orders WHERE `Created on` > '2030'",
+    # Predicates that must not be pruned
+    "SELECT COUNT(*) FROM procurement_orders WHERE `Created on` < '2021-02-01' OR Vendor = 'Acme'",
+    "SELECT COUNT(*) FROM procurement_orders WHERE CASE WHEN qty > 5 AND `Created on` >= '2023' "
+    "AND qty < 100 THEN 0 ELSE 1 END = 1",
+    "SELECT COUNT(*) FROM procurement_orders WHERE NOT `Created on` >= '2022'",
+    # Errors surface the same way
+    "SELECT * FROM procurement_orders WHERE bogus = 1",
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_matches_single_file(managers, query):
+    single, partitioned = managers
+    ordered = "ORDER BY" in query.upper()
+    assert _normalize(partitioned.execute_query(query), ordered) == _normalize(single.execute_query(query), ordered)
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT COUNT(DISTINCT Vendor) FROM procurement_orders",
+    "SELECT * FROM procurement_orders WHERE qty = (SELECT MAX(qty) FROM procurement_orders) ORDER BY `PO Name`",
+    "SELECT `PO Name`, ROW_NUMBER() OVER (ORDER BY qty, `PO Name`) FROM procurement_orders ORDER BY 2 LIMIT 3",
+    "SELECT Vendor, SUM(qty) FROM procurement_orders GROUP BY Vendor",
+])
+def test_more_partitions_than_attach_limit(tmp_path, query):
+    # SQLite attaches at most 10 databases by default.
+    years = tuple(str(year) for year in range(2010, 2024))
+    source = str(tmp_path / "synthetic_po.db")
+    _build_source(source, years)
+    partitions = PartitionedDatabaseManager.create_partitions(source, str(tmp_path))
+    assert len(partitions) == len(years)
+
+    with PartitionedDatabaseManager(partitions) as partitioned:
+        result = partitioned.execute_query(query)
+    assert "error" not in result
+    ordered = "ORDER BY" in query.upper()
+    assert _normalize(result, ordered) == _normalize(DatabaseManager(source).execute_query(query), ordered)
+
+
+@pytest.mark.parametrize("where, years", [
+    (None, YEARS),
+    ("`Created on` >= '2022-03-01' AND `Created on` < '2023-02-01'", ("2022", "2023")),
+    ("'2021-12-31' >= `Created on`", ("2021",)),
+    ("`Created on` BETWEEN '2022-01-01' AND '2022-12-31' AND qty > 3", ("2022",)),
+    ("`Created on` LIKE '2023%'", ("2023",)),
+    ("strftime('%Y', `Created on`) = '2022'", ("2022",)),
+    ("substr(`Created on`, 1, 4) > '2021'", ("2022", "2023")),
+    ("`Created on` = '2030-01-01'", ()),
+    ("`Created on` < '2022' OR qty > 5", YEARS),
+    ("CASE WHEN qty > 5 AND `Created on` >= '2023' AND qty < 100 THEN 0 ELSE 1 END = 1", YEARS),
+    ("`Created on` NOT BETWEEN '2021' AND '2022'", YEARS),
+    ("`Created on` IS NOT NULL AND `Created on` >= '2023'", YEARS),
+])
+def test_prune(managers, where, years):
+    _, partitioned = managers
+    pruned = partitioned._prune(where)
+    assert [partitioned.partitions[path][0] for path in pruned] == list(years)
+
+
+@pytest.mark.parametrize("query, uses_union", [
+    ("SELECT Vendor, AVG(qty) FROM procurement_orders GROUP BY Vendor", False),
+    ("SELECT COUNT(DISTINCT Vendor) FROM procurement_orders", True),
+    ("SELECT * FROM procurement_orders WHERE qty = (SELECT MAX(qty) FROM procurement_orders)", True),
+])
+def test_union_fallback(managers, monkeypatch, query, uses_union):
+    _, partitioned = managers
+    calls = []
+    run_union = PartitionedDatabaseManager._run_union
+    monkeypatch.setattr(
+        PartitionedDatabaseManager, "_run_union",
+        lambda self, paths, q: calls.append(q) or run_union(self, paths, q),
+    )
+    assert "error" not in partitioned.execute_query(query)
+    assert bool(calls) == uses_union
+
+
+def test_create_partitions_refuses_existing_target(tmp_path):
+    source = str(tmp_path / "synthetic_po.db")
+    _build_source(source)
+    (tmp_path / "synthetic_po_2023.db").write_bytes(b"")
+
+    with pytest.raises(Exception, match="already exists"):
+        PartitionedDatabaseManager.create_partitions(source, str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["synthetic_po.db", "synthetic_po_2023.db"]
+
+
+def test_create_partitions_cleans_up_on_failure(tmp_path, monkeypatch):
+    source = str(tmp_path / "synthetic_po.db")
+    _build_source(source)
+    connect = sqlite3.connect
+
+    def failing_connect(path, *args, **kwargs):
+        if str(path).endswith("_2022.db.tmp"):
+            raise sqlite3.OperationalError("disk I/O error")
+        return connect(path, *args, **kwargs)
+
+    monkeypatch.setattr(database_manager.sqlite3, "connect", failing_connect)
+    with pytest.raises(sqlite3.OperationalError):
+        PartitionedDatabaseManager.create_partitions(source, str(tmp_path))
+    assert os.listdir(tmp_path) == ["synthetic_po.db"]
+
+
+def test_close_shuts_down_pool(tmp_path):
+    source = str(tmp_path / "synthetic_po.db")
+    _build_source(source)
+    with PartitionedDatabaseManager({source: (None, None)}) as manager:
+        assert "error" not in manager.execute_query("SELECT COUNT(*) FROM procurement_orders")
+    with pytest.raises(RuntimeError):
+        manager._pool.submit(print)